@@ -5,16 +5,19 @@ This module extracts FAQs from various websites, segregates them by organization
 and stores them in a structured format. Supports both single URL and multiple URLs.
 """
 
+import asyncio
+import csv
+import hashlib
 import json
 import logging
 import os
 import re
-import time
 from typing import Dict, List, Optional, Any, Tuple, Union
 
-import pandas as pd
+import diskcache
+import httpx
+import orjson
 from dotenv import load_dotenv
-from firecrawl import FirecrawlApp
 from langchain_community.document_loaders import FireCrawlLoader
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import RunnablePassthrough
@@ -32,41 +35,170 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+FIRECRAWL_API_URL = "https://api.firecrawl.dev"
+CRAWL_POLL_INTERVAL = 2  # seconds between crawl job status checks
+CRAWL_TIMEOUT = 300  # seconds a single crawl job may take before it is abandoned
+HTTP_TIMEOUT = 120
+MAX_CONCURRENCY = 5
+LLM_MAX_CONCURRENCY = 8
+LLM_CACHE_DIR = ".faq_llm_cache"
+# Bump whenever the extraction prompt changes so stale cached answers are not reused
+PROMPT_VERSION = "v1"
+
+_JSON_DECODER = json.JSONDecoder()
+_FAQ_HINT_RE = re.compile(r'\b(?:FAQ|frequently asked|Q:)', re.IGNORECASE)
+MIN_QUESTION_MARKS = 3  # pages with this many '?' are treated as FAQ-like without a keyword
+
+# Markdown boilerplate stripped before prompting: image-only lines, link-only
+# (navigation) lines and runs of blank lines
+_IMG_LINE = re.compile(
+    r'^[ \t]*(?:\[?!\[[^\]\n]*\]\([^)\n]*\)(?:\]\([^)\n]*\))?[ \t]*)+$\n?', re.MULTILINE
+)
+_NAV_LINE = re.compile(r'^[ \t]*(?:[-*+][ \t]+)?\[[^\]\n]*\]\([^)\n]*\)[ \t]*$\n?', re.MULTILINE)
+_WS_RE = re.compile(r'\n(?:[ \t]*\n){2,}')
+# Section-title headings only; a heading that merely mentions "questions" may itself be an FAQ entry
+_FAQ_HEADING_RE = re.compile(r'^#+[ \t]+.*\b(?:FAQs?|Frequently Asked Questions)\b', re.IGNORECASE | re.MULTILINE)
+
+FAQ_COLUMNS = ('organisation_name', 'category', 'question', 'answer', 'links', 'URL')
+DEFAULT_CSV_FILENAME = "extracted_duplicate_links23.csv"
+_FAQ_DEFAULTS = dict.fromkeys(('organisation_name', 'category', 'question', 'answer', 'links'), "Not available")
+
+# Static instructions and examples of the extraction prompt. Kept as a constant so
+# every request shares an identical prefix and only the page content is formatted in.
+_PROMPT_PREFIX = """
+Task:
+
+Extract frequently asked questions (FAQs) from the given markdown or context.
+Read the markdown document from starting to end. Identify the question and you will get the answer.
+Extract each question and entire answer for the same question.
+DO NOT include "Related Articles" sections or links to other FAQ questions in the extracted answer.
+Identify and structure the data in JSON format with the following fields:
+
+Expected output:
+
+organisation_name: The name of the university or organization.
+category: The category the FAQs belong to.
+question: The FAQ question.
+answer: A concise response extracted from the markdown or context.
+links (if available): Any hyperlinks related to the FAQ, including the display text and URL only if available.
+
+Ensure the extracted text remains accurate and preserves key details. If links are embedded within the answer, extract them separately in a structured format. Ignore or exclude any links that point to other FAQ questions or that appear in "Related Articles" sections.
+
+Examples:
+Example 1: Extracting FAQs
+Input:
+
+What financial aid is available?
+Watch our financial aid overview video here to learn about which financial aid services we offer, how much tuition costs, and how to make college affordable.
+
+Expected Output:
+
+{
+  "question": "What financial aid is available?",
+  "answer": "Watch our financial aid overview video to learn about which financial aid services we offer, how much tuition costs, and how to make college affordable.",
+  "links": [
+    {
+      "text": "Financial Aid Overview Video",
+      "url": "https://www.nu.edu/admissions/financial-aid-and-scholarships/"
+    }
+  ]
+}
+
+"""
+
+
+def _decode_json_objects(
+    text: str, pos: int = 0, final: bool = True
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Decode consecutive JSON objects from text with `json.JSONDecoder.raw_decode`.
+
+    Starts at each `{` that is not already part of a decoded object, so nesting
+    depth is unbounded. While the text is still growing (`final` is False),
+    decoding stops at the first object that does not parse yet and returns its
+    offset, so it can be retried once more text has arrived. Each retry
+    re-parses that object from its start; callers streaming text should space
+    retries out (see `_stream_faqs_async`) so a large unfinished object, such
+    as an answer wrapped in `{"faqs": [...]}`, is not re-parsed on every chunk.
+
+    Args:
+        text: Text containing JSON objects
+        pos: Offset to start scanning from
+        final: Whether the text is complete
+
+    Returns:
+        Tuple of decoded objects and the offset to resume scanning from
+    """
+    objects = []
+    while True:
+        start = text.find('{', pos)
+        if start < 0:
+            return objects, len(text)
+        try:
+            obj, pos = _JSON_DECODER.raw_decode(text, start)
+            objects.append(obj)
+        except json.JSONDecodeError:
+            if not final:
+                return objects, start
+            pos = start + 1
+
 
 class FAQExtractor:
     """
     A class to extract FAQs from websites and organize them by organization.
     """
 
-    def __init__(self, firecrawl_api_key: str, google_api_key: str):
+    def __init__(
+        self,
+        firecrawl_api_key: str,
+        google_api_key: str,
+        csv_filename: Optional[str] = None,
+        skip_non_faq_pages: bool = True,
+        cache: Optional[diskcache.Cache] = None
+    ):
         """
         Initialize the FAQ extractor with necessary API keys.
 
         Args:
             firecrawl_api_key: API key for FireCrawl service
             google_api_key: API key for Google Generative AI
+            csv_filename: If given, each FAQ row is written to this CSV file as
+                soon as it is extracted, instead of all at once in `save_to_csv`
+            skip_non_faq_pages: Skip the LLM call for pages with no FAQ-like content
+            cache: LLM response cache to share between extractors (opens
+                `LLM_CACHE_DIR` if not given)
         """
-        self.app = FirecrawlApp(api_key=firecrawl_api_key)
+        self.firecrawl_api_key = firecrawl_api_key
+        self._http_client: Optional[httpx.AsyncClient] = None
         self.llm = self._initialize_llm(google_api_key)
-        self.data_dict = self._initialize_data_dict()
+        self.rows: List[Dict[str, Any]] = []
+        self.url_index: Dict[str, int] = {}  # URL -> position of its first row
         self.notcollected = []
-
-    @staticmethod
-    def _initialize_data_dict() -> Dict[str, List]:
+        # Progress of the current run; read from other threads to report status
+        self.progress = 0
+        self.total_urls = 0
+        self.skip_non_faq_pages = skip_non_faq_pages
+        self._cache = cache if cache is not None else diskcache.Cache(LLM_CACHE_DIR)
+
+        self._csv_fh = None
+        self._writer: Optional[csv.DictWriter] = None
+        if csv_filename:
+            self._csv_fh = open(csv_filename, 'w', newline='', encoding='utf-8-sig')
+            self._writer = csv.DictWriter(self._csv_fh, fieldnames=FAQ_COLUMNS, extrasaction='ignore')
+            self._writer.writeheader()
+
+    @property
+    def data_dict(self) -> Dict[str, List]:
         """
-        Initialize the data dictionary with empty lists for each field.
+        Column-oriented view of the extracted rows, one list per field.
+
+        Rebuilt from `rows` on each access; kept for callers that expect the
+        original parallel-list layout.
 
         Returns:
-            Dictionary with empty lists for each field
+            Dictionary mapping each field to its list of values
         """
-        return {
-            'organisation_name': [],
-            'category': [],
-            'question': [],
-            'answer': [],
-            'links': [],
-            'URL': []
-        }
+        return {field: [row[field] for row in self.rows] for field in FAQ_COLUMNS}
 
     @staticmethod
     def _initialize_llm(api_key: str) -> ChatGoogleGenerativeAI:
@@ -89,36 +221,71 @@ class FAQExtractor:
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=60),
+        sleep=asyncio.sleep,
         reraise=True
     )
-    def _crawl_website(self, url: str) -> Optional[str]:
+    async def _crawl_website_async(self, url: str) -> str:
         """
-        Crawl a website and extract its content.
+        Crawl a website through the FireCrawl REST API and extract its content.
+
+        Uses the shared HTTP client opened by `_extract_faqs_async`, so crawl
+        jobs for different URLs can be in flight at the same time. Failed
+        attempts are retried with backoff on the event loop, so other crawls
+        keep running while this one waits.
 
         Args:
             url: Website URL to crawl
 
         Returns:
-            Extracted markdown content or None if extraction failed
+            Extracted markdown content
+
+        Raises:
+            Exception: If the crawl still fails after all retries, including
+                crawl jobs that end in any status other than completed or do
+                not finish within `CRAWL_TIMEOUT`
         """
-        try:
-            crawl_result = self.app.crawl_url(
-                url,
-                params={
-                    'limit': 1,
-                    'scrapeOptions': {
-                        'formats': ['markdown'],
-                        'actions': [{"type": "wait", "milliseconds": 10000}]
-                    }
+        response = await self._http_client.post(
+            "/v1/crawl",
+            json={
+                'url': url,
+                'limit': 1,
+                'scrapeOptions': {
+                    'formats': ['markdown'],
+                    'actions': [{"type": "wait", "milliseconds": 10000}]
                 }
-            )
-            print(crawl_result)
-            return crawl_result['data'][0]['markdown']
-        except Exception as e:
-            logger.error(f"Failed to crawl {url}: {str(e)}")
-            self.notcollected.append(url)
-            time.sleep(30)
-            return None
+            }
+        )
+        response.raise_for_status()
+        job_id = response.json()['id']
+
+        # Bound the wait so a stuck job cannot hold its concurrency slot forever
+        crawl_result = await asyncio.wait_for(self._poll_crawl_async(job_id), CRAWL_TIMEOUT)
+        logger.debug(crawl_result)
+        return crawl_result['data'][0]['markdown']
+
+    async def _poll_crawl_async(self, job_id: str) -> Dict[str, Any]:
+        """
+        Poll a FireCrawl crawl job until it completes.
+
+        Args:
+            job_id: FireCrawl crawl job ID
+
+        Returns:
+            Crawl job status payload
+
+        Raises:
+            RuntimeError: If the job ends in any status other than completed
+        """
+        while True:
+            await asyncio.sleep(CRAWL_POLL_INTERVAL)
+            response = await self._http_client.get(f"/v1/crawl/{job_id}")
+            response.raise_for_status()
+            crawl_result = response.json()
+            status = crawl_result.get('status')
+            if status == 'completed':
+                return crawl_result
+            if status != 'scraping':
+                raise RuntimeError(f"Crawl job {job_id} ended with status {status!r}")
 
     def _create_extraction_template(self, context: str) -> str:
         """
@@ -130,67 +297,57 @@ class FAQExtractor:
         Returns:
             Formatted prompt template
         """
-        return f"""
-        Task:
-
-        Extract frequently asked questions (FAQs) from the given markdown or context.
-        Read the markdown document from starting to end. Identify the question and you will get the answer.
-        Extract each question and entire answer for the same question.
-        DO NOT include "Related Articles" sections or links to other FAQ questions in the extracted answer.
-        Identify and structure the data in JSON format with the following fields:
+        return f'{_PROMPT_PREFIX}context:["placeholder","{context}"]\n'
 
-        Expected output:
+    @staticmethod
+    def _looks_like_faq(markdown: str) -> bool:
+        """
+        Cheaply check whether a page could contain FAQs before paying for an LLM call.
 
-        organisation_name: The name of the university or organization.
-        category: The category the FAQs belong to.
-        question: The FAQ question.
-        answer: A concise response extracted from the markdown or context.
-        links (if available): Any hyperlinks related to the FAQ, including the display text and URL only if available.
-        
-        Ensure the extracted text remains accurate and preserves key details. If links are embedded within the answer, extract them separately in a structured format. Ignore or exclude any links that point to other FAQ questions or that appear in "Related Articles" sections.
+        Args:
+            markdown: Website content in markdown format
 
-        Examples:
-        Example 1: Extracting FAQs
-        Input:
+        Returns:
+            True if the page has questions and either an FAQ keyword or several questions
+        """
+        question_marks = markdown.count('?')
+        if not question_marks:
+            return False
+        return question_marks >= MIN_QUESTION_MARKS or _FAQ_HINT_RE.search(markdown) is not None
 
-        What financial aid is available?
-        Watch our financial aid overview video here to learn about which financial aid services we offer, how much tuition costs, and how to make college affordable.
+    @staticmethod
+    def _compact_markdown(markdown: str) -> str:
+        """
+        Strip boilerplate from crawled markdown to cut prompt tokens.
 
-        Expected Output:
+        Drops everything before the first FAQ section heading (if there is one),
+        image-only lines, link-only navigation lines and repeated blank lines.
 
-        {{
-          "question": "What financial aid is available?",
-          "answer": "Watch our financial aid overview video to learn about which financial aid services we offer, how much tuition costs, and how to make college affordable.",
-          "links": [
-            {{
-              "text": "Financial Aid Overview Video",
-              "url": "https://www.nu.edu/admissions/financial-aid-and-scholarships/"
-            }}
-          ]
-        }}
+        Args:
+            markdown: Website content in markdown format
 
-        context:["placeholder","{context}"]\n
+        Returns:
+            Compacted markdown
         """
+        heading = _FAQ_HEADING_RE.search(markdown)
+        if heading:
+            markdown = markdown[heading.start():]
+        markdown = _IMG_LINE.sub('', markdown)
+        markdown = _NAV_LINE.sub('', markdown)
+        return _WS_RE.sub('\n\n', markdown).strip()
 
-    def _extract_json_from_response(self, response_content: str) -> Dict[str, Any]:
+    @staticmethod
+    def _cache_key(context: str) -> str:
         """
-        Extract JSON object from LLM response.
+        Build the LLM cache key for a page's markdown content.
 
         Args:
-            response_content: LLM response content
+            context: Website content in markdown format
 
         Returns:
-            Extracted JSON object
+            Content hash tagged with the prompt version
         """
-        try:
-            json_pattern = r'\{(?:[^{}]|(?:\{(?:[^{}]|(?:\{[^{}]*\}))*\}))*\}'
-            matches = re.findall(json_pattern, response_content, re.DOTALL)
-            if not matches:
-                raise ValueError("No JSON object found in the response")
-            return matches
-        except:
-            logger.error("Failed to extract JSON from LLM response")
-            return {}
+        return f"{hashlib.sha256(context.encode('utf-8')).hexdigest()}:{PROMPT_VERSION}"
 
     def _process_faq_data(self, json_obj: Dict[str, Any], url: str) -> None:
         """
@@ -200,16 +357,19 @@ class FAQExtractor:
             json_obj: Extracted FAQ data
             url: Source URL
         """
-        for field in ['organisation_name', 'category', 'question', 'answer', 'links']:
-            if field not in json_obj:
-                json_obj[field] = "Not available"
-        
-        self.data_dict["organisation_name"].append(json_obj['organisation_name'])
-        self.data_dict["category"].append(json_obj['category'])
-        self.data_dict["question"].append(json_obj['question'])
-        self.data_dict["answer"].append(json_obj['answer'])
-        self.data_dict["links"].append(json_obj['links'])
-        self.data_dict['URL'].append(url)
+        row = {**_FAQ_DEFAULTS, **json_obj, 'URL': url}
+
+        # Store links as a JSON string so the CSV column round-trips with any JSON reader
+        if not isinstance(row['links'], str):
+            row['links'] = orjson.dumps(row['links']).decode()
+
+        self.url_index.setdefault(url, len(self.rows))
+        self.rows.append(row)
+
+        # Flush per row so a crash mid-run still leaves every extracted FAQ on disk
+        if self._writer:
+            self._writer.writerow(row)
+            self._csv_fh.flush()
 
     def process_single_url(self, url: str) -> Dict[str, Any]:
         """
@@ -221,50 +381,167 @@ class FAQExtractor:
         Returns:
             Dictionary containing extracted FAQ data for this URL
         """
-        logger.info(f"Processing single URL: {url}")
-        
-        # Skip if URL already processed
-        if url in self.data_dict['URL']:
-            logger.info(f"URL already processed: {url}")
-            return self._get_url_data(url)
-        
-        try:
-            # Crawl website
-            context = self._crawl_website(url)
+        asyncio.run(self._extract_faqs_async([url], max_concurrency=1))
+        return self._get_url_data(url)
+
+    async def _fetch_context_async(self, url: str, sem: asyncio.Semaphore) -> Optional[str]:
+        """
+        Crawl a URL while holding one of the shared concurrency slots.
+
+        Args:
+            url: URL to crawl
+            sem: Semaphore bounding the number of crawls in flight
+
+        Returns:
+            Extracted markdown content or None if extraction failed
+        """
+        async with sem:
+            logger.info(f"Crawling URL: {url}")
+            try:
+                context = await self._crawl_website_async(url)
+            except Exception as e:
+                logger.error(f"Failed to crawl {url}: {str(e)}")
+                self.notcollected.append(url)
+                return None
             if not context:
                 logger.warning(f"No content extracted from {url}")
-                return {}
-            
-            # Create extraction template
-            template = self._create_extraction_template(context)
-            
-            # Extract FAQs using LLM
-            answer = self.llm.invoke(template)
-            
-            # Parse response
-            json_obj = self._extract_json_from_response(answer.content)
-            #print(json_obj)
-            # Process and store data
-            for jsondict in json_obj:
-                try: 
-                    self._process_faq_data(json.loads(jsondict), url)
-                    pass
-                except (json.JSONDecodeError, IndexError) as e:
-                    logger.error(f"Failed to parse JSON from response: {str(e)}")
-                    raise
-            
-            
-            logger.info(f"Successfully extracted FAQ from {url}")
-            
-            return self._get_url_data(url)
-            
+            return context
+
+    async def _stream_faqs_async(
+        self, url: str, key: str, template: str, sem: asyncio.Semaphore
+    ) -> None:
+        """
+        Stream the LLM answer for one page, storing each FAQ as soon as its JSON object closes.
+
+        FAQs decoded before a mid-stream failure are kept; the response is only
+        cached once the stream has completed.
+
+        Args:
+            url: Source URL
+            key: LLM cache key for the page content
+            template: Extraction prompt for the page
+            sem: Semaphore bounding the number of LLM calls in flight
+        """
+        async with sem:
+            buffer = ''
+            pos = 0
+            retry_at = 0
+            faqs = []
+
+            def drain(final: bool) -> None:
+                nonlocal pos, retry_at
+                decoded, pos = _decode_json_objects(buffer, pos, final=final)
+                self._store_faqs(decoded, url)
+                faqs.extend(decoded)
+                # An unfinished object is only retried once the buffer has grown by
+                # its current length, keeping total parsing linear in the answer size
+                retry_at = 2 * len(buffer) - pos
+
+            try:
+                async for chunk in self.llm.astream(template):
+                    buffer += chunk.content
+                    if len(buffer) >= retry_at:
+                        drain(final=False)
+
+                # The stream is complete, so skip past anything that never parsed
+                drain(final=True)
+
+                if not faqs:
+                    logger.error(f"Failed to extract JSON from LLM response for {url}")
+                    return
+                self._cache.set(key, faqs)
+            except Exception as e:
+                logger.error(f"Error processing {url} after {len(faqs)} FAQs: {str(e)}")
+                return
+            logger.info(f"Successfully extracted {len(faqs)} FAQs from {url}")
+
+    def _store_faqs(self, faqs: List[Dict[str, Any]], url: str) -> None:
+        """
+        Store every FAQ extracted for a URL.
+
+        Args:
+            faqs: Extracted FAQ objects
+            url: Source URL
+        """
+        for faq in faqs:
+            self._process_faq_data(faq, url)
+
+    async def _process_url_async(
+        self, url: str, crawl_sem: asyncio.Semaphore, llm_sem: asyncio.Semaphore
+    ) -> None:
+        """
+        Crawl one URL and extract its FAQs, counting it towards `progress` once done.
+
+        Cached pages are served without an LLM call and pages with no FAQ-like
+        content are skipped. Errors are logged and confined to this URL, so one
+        bad page never aborts the rest of the run.
+
+        Args:
+            url: URL to process
+            crawl_sem: Semaphore bounding the number of crawls in flight
+            llm_sem: Semaphore bounding the number of LLM calls in flight
+        """
+        try:
+            context = await self._fetch_context_async(url, crawl_sem)
+            if not context:
+                return
+            context = self._compact_markdown(context)
+            if self.skip_non_faq_pages and not self._looks_like_faq(context):
+                logger.info(f"No FAQ-like content found on {url}, skipping LLM call")
+                self.notcollected.append(url)
+                return
+            key = self._cache_key(context)
+            if key in self._cache:
+                logger.info(f"Using cached LLM response for {url}")
+                faqs = self._cache[key]
+                self._store_faqs(faqs, url)
+                logger.info(f"Successfully extracted {len(faqs)} FAQs from {url}")
+                return
+            await self._stream_faqs_async(url, key, self._create_extraction_template(context), llm_sem)
         except Exception as e:
             logger.error(f"Error processing {url}: {str(e)}")
-            return {}
+        finally:
+            self.progress += 1
+
+    async def _extract_faqs_async(self, urls: List[str], max_concurrency: int) -> None:
+        """
+        Crawl URLs concurrently, streaming each page through the LLM as soon as its crawl finishes.
+
+        Args:
+            urls: URLs to process
+            max_concurrency: Maximum number of crawls in flight at once
+        """
+        # Collapse repeated URLs and skip ones already extracted
+        unique_urls = list(dict.fromkeys(urls))
+        pending_urls = []
+        for url in unique_urls:
+            if url in self.url_index:
+                logger.info(f"URL already processed: {url}")
+            else:
+                pending_urls.append(url)
+        self.total_urls = len(unique_urls)
+        self.progress = self.total_urls - len(pending_urls)
+
+        # Run each page through crawl -> LLM on its own over a shared HTTP client,
+        # so no page waits for the slowest crawl before its LLM call starts
+        crawl_sem = asyncio.Semaphore(max_concurrency)
+        llm_sem = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+        async with httpx.AsyncClient(
+            base_url=FIRECRAWL_API_URL,
+            headers={'Authorization': f"Bearer {self.firecrawl_api_key}"},
+            timeout=HTTP_TIMEOUT
+        ) as client:
+            self._http_client = client
+            try:
+                await asyncio.gather(
+                    *(self._process_url_async(url, crawl_sem, llm_sem) for url in pending_urls)
+                )
+            finally:
+                self._http_client = None
 
     def _get_url_data(self, url: str) -> Dict[str, Any]:
         """
-        Get the data for a specific URL from the data dictionary.
+        Get the data for a specific URL from the stored rows.
 
         Args:
             url: URL to retrieve data for
@@ -272,26 +549,24 @@ class FAQExtractor:
         Returns:
             Dictionary containing the data for the specified URL
         """
-        if url not in self.data_dict['URL']:
+        if url not in self.url_index:
             return {}
-        
-        idx = self.data_dict['URL'].index(url)
-        return {
-            'organisation_name': self.data_dict['organisation_name'][idx],
-            'category': self.data_dict['category'][idx],
-            'question': self.data_dict['question'][idx],
-            'answer': self.data_dict['answer'][idx],
-            'links': self.data_dict['links'][idx],
-            'URL': url
-        }
-
-    def extract_faqs(self, urls: Union[str, List[str]], max_urls: Optional[int] = None) -> Dict[str, List]:
+
+        return dict(self.rows[self.url_index[url]])
+
+    def extract_faqs(
+        self,
+        urls: Union[str, List[str]],
+        max_urls: Optional[int] = None,
+        max_concurrency: int = MAX_CONCURRENCY
+    ) -> Dict[str, List]:
         """
         Extract FAQs from a single URL or multiple URLs.
 
         Args:
             urls: Single URL string or list of URLs to process
             max_urls: Maximum number of URLs to process (optional, only applies to list input)
+            max_concurrency: Maximum number of URLs crawled at once
 
         Returns:
             Dictionary containing extracted FAQ data
@@ -300,28 +575,37 @@ class FAQExtractor:
         if isinstance(urls, str):
             self.process_single_url(urls)
             return self.data_dict
-        
+
         # Handle list of URLs case
         if max_urls:
             urls = urls[:max_urls]
-        
-        total_urls = len(urls)
-        for i, url in enumerate(urls):
-            logger.info(f"Processing URL {i+1}/{total_urls}: {url}")
-            self.process_single_url(url)
-        
+
+        logger.info(f"Processing {len(urls)} URLs with concurrency {max_concurrency}")
+        asyncio.run(self._extract_faqs_async(urls, max_concurrency))
+
         return self.data_dict
 
-    def save_to_csv(self, filename: str = "extracted_duplicate_links23.csv") -> None:
+    def save_to_csv(self, filename: str = DEFAULT_CSV_FILENAME) -> None:
         """
         Save the extracted FAQ data to a CSV file.
 
+        When rows are being streamed to the `csv_filename` given at construction,
+        that file already holds every row, so it is just closed.
+
         Args:
-            filename: Name of the output CSV file
+            filename: Name of the output CSV file (ignored when streaming)
         """
         try:
-            df = pd.DataFrame(self.data_dict)
-            df.to_csv(filename, index=False,encoding = 'utf-8-sig')
+            if self._csv_fh:
+                filename = self._csv_fh.name
+                self._csv_fh.close()
+                self._csv_fh = None
+                self._writer = None
+            else:
+                with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
+                    writer = csv.DictWriter(f, fieldnames=FAQ_COLUMNS, extrasaction='ignore')
+                    writer.writeheader()
+                    writer.writerows(self.rows)
             logger.info(f"FAQ data saved to {filename}")
         except Exception as e:
             logger.error(f"Failed to save data to CSV: {str(e)}")
@@ -350,17 +634,23 @@ def main():
     """
     Main function to run the FAQ extraction process.
     """
+    import pandas as pd
+
     try:
         # Load API keys from environment variables
         firecrawl_api_key, google_api_key = load_environment_variables()
         
         # Initialize FAQ extractor
-        extractor = FAQExtractor(firecrawl_api_key, google_api_key)
+        extractor = FAQExtractor(firecrawl_api_key, google_api_key, csv_filename=DEFAULT_CSV_FILENAME)
         
         # Example of handling both input types
         try:
-            # First try to read URLs from a CSV file
-            df = pd.read_csv(r"E:\All_Folder\VS_Code\Scrapping_project\plattslinks - Copy.csv")
+            # First try to read URLs from a CSV file, parsing only the Links column
+            input_csv = r"E:\All_Folder\VS_Code\Scrapping_project\plattslinks - Copy.csv"
+            try:
+                df = pd.read_csv(input_csv, usecols=["Links"], engine="pyarrow")
+            except ImportError:
+                df = pd.read_csv(input_csv, usecols=["Links"], engine="c")
             urls = df["Links"].tolist()
             logger.info(f"Found {len(urls)} URLs in input CSV file")
         except Exception as e:
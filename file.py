@@ -1,9 +1,10 @@
 import os
-import re
 import json
 import logging
 from typing import Dict, List, Optional, Any
 
+from firecrawl import FirecrawlApp
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -11,6 +12,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger("faq_extractor")
 
+_JSON_DECODER = json.JSONDecoder()
+
 class FAQExtractor:
     """Class to extract FAQs from websites using Firecrawl and LLM processing."""
     
@@ -24,6 +27,7 @@ class FAQExtractor:
         """
         self.firecrawl_api_key = firecrawl_api_key
         self.google_api_key = google_api_key
+        self.app = FirecrawlApp(api_key=firecrawl_api_key)
         self._setup_llm()
         
     def _setup_llm(self) -> None:
@@ -58,10 +62,7 @@ class FAQExtractor:
             Extracted markdown content or None if failed
         """
         try:
-            from firecrawl import FirecrawlApp
-            app = FirecrawlApp(api_key=self.firecrawl_api_key)
-            
-            crawl_result = app.crawl_url(url, params={
+            crawl_result = self.app.crawl_url(url, params={
                 'limit': limit,
                 'scrapeOptions': {
                     'formats': ['markdown'],
@@ -81,9 +82,6 @@ class FAQExtractor:
             logger.info(f"Successfully crawled URL: {url}")
             return context
             
-        except ImportError as e:
-            logger.error(f"Failed to import Firecrawl module: {e}")
-            return None
         except Exception as e:
             logger.error(f"Error during website crawling: {e}")
             return None
@@ -164,22 +162,23 @@ context:["placeholder","{context}"]/n
                 logger.error("LLM returned invalid response format")
                 return None
                 
-            # Extract JSON objects using regex from response content
-            json_pattern = r'\{(?:[^{}]|(?:\{(?:[^{}]|(?:\{[^{}]*\}))*\}))*\}'
-            matches = re.findall(json_pattern, response.content, re.DOTALL)
-            
-            if not matches:
-                logger.warning("No JSON objects found in LLM response")
-                return []
-                
-            # Process each match
+            # Decode JSON objects from response content, resuming after each one
+            content = response.content
             extracted_data = []
-            for match in matches:
+            pos = 0
+            while True:
+                start = content.find('{', pos)
+                if start < 0:
+                    break
                 try:
-                    json_obj = json.loads(match)
+                    json_obj, pos = _JSON_DECODER.raw_decode(content, start)
                     extracted_data.append(json_obj)
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Skipping invalid JSON: {e}")
+                except json.JSONDecodeError:
+                    pos = start + 1
+
+            if not extracted_data:
+                logger.warning("No JSON objects found in LLM response")
+                return []
                     
             logger.info(f"Successfully extracted {len(extracted_data)} FAQ items")
             return extracted_data
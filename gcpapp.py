@@ -1,63 +1,384 @@
 import streamlit as st
-import pandas as pd
+import atexit
+import base64
+import codecs
+import csv
+import gzip
+import io
 import logging
+import logging.handlers
 import os
+import queue
+import re
+# pyarrow is a Streamlit dependency, so importing it here adds no install or load cost
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from dotenv import load_dotenv
 import time
-import base64
-from commonscrape import *
-import google.cloud.storage as storage
-import random
+from concurrent.futures import ThreadPoolExecutor
 
 # Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
+@st.cache_resource(show_spinner=False)
+def setup_logging():
+    """
+    Route log records through a queue so console and file writes happen on a
+    background thread instead of blocking the script thread.
+    """
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(
+        log_queue,
         logging.StreamHandler(),
         logging.FileHandler("faq_extractor.log")
-    ]
-)
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.handlers.QueueHandler(log_queue)],
+        force=True
+    )
+    return listener
+
+setup_logging()
 logger = logging.getLogger("faq_extractor")
 
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024  # Resumable upload chunk size (must be a multiple of 256 KiB)
+
+# Links from an uploaded CSV must be absolute http(s) URLs
+_URL_RE = re.compile(r"^https?://[^\s<>\"]+$")
+
+_LOGO_B64 = "iVBORw0KGgoAAAANSUhEUgAAAXAAAACJCAMAAAACLZNoAAAAllBMVEX///+LB+OHAOKDAOGCAOG6g+6aO+bOqPLKovKdRuezeOy+i++VK+XavvXn1/m3ge348f2nWunz6fzhy/f79/717fylVunDlPD59P3VtvTYvPXQrfPt3/rfx/fw5PusZ+qXNObp2fnkz/iQG+THnPGwcOuiUOjLpPKpYerTs/TPq/OWL+WydOytaOqPFeTEl/CgSujAj++zlD4RAAAPtElEQVR4nO1d6WLqKhA2A2rd61b3LtrFnm72/V/uJkDCsIaovVab78/pMQbhCwyzkkqlRIkSJUqUKFGiRIkSJUqUKFGixA9h1Gl9PH13Tt2NP4MWIRCDwOOpe/InMIhIxAEkKmf5j2MMEGUA+nHq/lw8GoDorg5O3Z2Lx5xKvu9Lun8eUTbB4ebUffkLmBA5v7MPB8P5az0Es/Xpen6euJYChY75R4sboCQY9H182hGcGbZSoEzYB1exSh4VAdDZicdwTljLCU7YB/2CdLOlUTIejDc5wZvJ/5vEx6yT8VKqBGIh+SXD+P8P1EOrG1AaS4FANiaTKE/F5Qmf4tenHsl5oIpszFryAexJOFmceihngQESINCLPxgXkyiJg1H89X7qsZwFbrDT6iX+4KHAlgmEvD0/1whN1Bq+Pkr4scLzmSRu2W4w4UDfu7yV2/o9jSf6SUdyJthggU0S/kIJB9qaooaGbQKnGsQZ4Uphly4roYQDrY60tqr0FCM4L4xUcmnimA0hHOiHxcx5/d/7f3Z4VzVApknnEw6k9iAamNY/arX+ZHnKQZwRlpoGSBOhnEs4QOo2GfUoizsDfS6DFiFoaCZOCOHxXpneXpcmEtAHz++U4JjrJk4+4UBv0rk83GCfIoC+h5YwEOk2PHP4+Qgn0UrcO+5T9W7on3IoZ4GJwSy9rfgIBzpJ721Rw+FSOsRzcG36TLx6ONB+qgq+2vxbQEqh4sWdSRpJdj474UDehuLG7ps9IAR3pxzOsTEeT/O/VARdi1PQbdoDSQXG+M6UJgJ06PvB88Gq2gCaYLO9uj1aq28W2kiyJdoIh3YaXJg46Y6/tTla706ILyCpxzmxMBrd4zT7apvHLm9h5nidg1dJJxPfT3pxu3ppNZ8+npqt+up4s6o4VqDJS/JynIatYR0mN0zCIeLb4UMtL5q/XyB5UO8nSTDAQQiFft1quTarNrS+ruZdY8Me9qxftqCH0rMfjQVMj6MKVK3MOQinfFU1PdIkfTR7KOOzBjWeIxDasGiZFOxIUpE2TTXHuu76snn3M7rJGNG2+IgsGNjDaHbCReisFuK2pUWz3l70JSw5j4wYqdcGjh9SEwmjengcJZslum8pElL2cNzYB2knnMuJflBoueC+OYw8QgpIW3PQ5LrV6F2WObAP4fdGZ+A4QZWhI05sJZz3ZxYYWi60x7znCClk2jLkcwg0dcrvQbgSbkxqb0BkRh2MjWOcVi2FZz+4bjF6H25vXrfz2yRK8nSQUGvuTbhMsYyHcXdVf7wj9ChK4YurL0wP1wUZMz/Ds7GC58RtUP4LSp8OIzwiH/sSjooSakI0tSpHwMjZFSZSRraoxGN4chANU6NvAxNGoV2Q8Ii09iMcLe2juYWYDtFyjpQnK2vSg4WGe+GEw7OvBymmxvxm2h1J1HH153tWwhXFTmuJuRgMtdBxb/yzQmxJWxB61j4XRgeukn/cS5lz9W0h3K6320FXvk4I1DRvOqE3X/P1crnuPG5xcrqybUrCod3M8LEDqowJPuPvrp6aCnYyOrXpKVfev3jrchUfSRfsU5Yca1E2M7ClpPltWSj/X5F0rADVsKW0B7Qxx1dXN6n6Quv4c0S4amENXj5xg7Ysx7okfOfokyT8GDU040/g+9/KF9FhSt2Lwjh7Sg5LydFK3d+VWIArzcHGcDM+3LNeakENJ+GVxChHDbb1q5XKlSS8Ye8UIlzqJtNrCetdo+yy6tZgMjOXcKHnK/EcYCuuVkCm5Mc3leg1tSaBftN44mvCyUe4okVTM2/DR/ig+/DwsJQ5I+T1IcWaSljj5LvssprpxwhjS+XWN1nFdtGJ5N7FFbNVkSkOVVvXJNa4MepwMXao4SfwEl6ZIDX6yrjqI/yb1Y+hSSCrxdDcsGYHSzaJkgfFZTD5l/zt1X+p2C86TxFl3aDA9Tw0xRO3BaWGPoFb8aepPOOxOR/OyjA6/IRXUA/N4JOP8C/nQEil41cWM21CcwJ8ss/hKfnbr+LJsM1o2e12l7ctbrtlESKgu5f1eDRdzpsux1OO11BJSXcIVCtyCG9KTt+Mi/sSjnIbbG4L2apiIwlDkT+FnIx7qm95Ne694pUoQHto9i4ix4bg9RpiK6qQBz2HcBRUMX1OexMue2tRv2R9lDqQtCuEaV+PfsbJjUpCizuMR2zb1QvxHSE3yxSTwNKpkO2cQ/gQrX7j4t6EI8vbDNpm7iDNb57auUJfevIzLhPtGSZ0MxbdIua+cW0PKhN3Ki32HRQLEeUQvv4RwrGk0qMRcvfXlvQs7YpQkc1Ikk559P7SWa+ZGtwTasQrSTe40WpRf81+oXtvEeUeRzKaiGFugAw5hM9+RKRgtU4v1MtSTXTNX94jXEtGpppJGKGJVpR8VzTSFn646ROvwoevtHlbYpA7oCyHHmAiKcghXFouFsvHrxYmUE7oSZFclkoVqIOSNrlh22YOKQDB37rtd9eR/i7WCGULw3TP6Kb3ASGZumtLfXOVbSItiRTLuc0h/BM8l32ET8cxptJfBF/skwTJZWkqaut2AvbPK3g3BUitsIVPIU/2h+59pk/f3sfsMyGyxNSSKMsP2uqUOyuTkZ+/YEjcTzjSmOHbuFrEtNftJuk/Vd1a0jg0934ZXQGapQVUnXJFCIR/2dY3/qJ8jGrKLZD7dH81lowrZRzZ9ebe5oWX8BHqGTFzwA4hXPrWFcfX3KETMmBrmnymPorBjUOr+zT7M2Urw7CagG5T2aEtGVfdptQKPYWGjRuBHeLOR/gIpZLZduxDCEc/jMMr2cyxCji0kBNjMb1PTavPmnU5hG1eQxTqVZcMsScwBxGehQ9wVzyEK/u2zZdzEOHokmx66dIJOVQvN8hASt0U5W57254sQaLUna0sGYdqiA+Qc/2O5JbYCb+pjFKMH2aak8Gm3R9EODLOpRTM9HObNzjGt2qFA6SazKinyxW+bqofSM/gubtrh8UEtJFuxUMUobN7DVGetLuyM4dwpLiZbjRiM18PIhzJh8yiG7l1QgGtwgTIW7rf3T4rlFPmpLkmMY2ZxGovLE0olDdTjaOJDAVbPSEK11mvM+QR7oE94nQY4XKmZWkEsqbYtU7nen9RotJqI2+nfF5u48vScdKk97O5N5EEuPM36YrsnS1HH8XT3Q6A/QkHYnUXHEY4yu5Ola9M63f7g8yoDUh78EqkrxKxQF4pCP2A9b9KIO/gMSBtsXlI6WVTtFE6grtoYm/CgdhXzYGEo5A+9ydJB4Xb+W/L5pH7XWX2VNvUmkKz6NLUeBiwFfNY2+3uwcxzVQdLhaMxC5FbFGKccONOANmXcPh0DP9AwlHYhvc5S8/0+f5thysBqVnSuWL7XfzqI0XWyXjmUNwl5WySZ7u6VWaggI/z6Oz9CAfqzPs6lHAZwGNxiIFfJxSYWpWM2HTRZ0UsT0S/xhRUc3B54x02UMU+shKOhLgz3rwH4bHO3ncX/R9KuFSr2aacfdmfFPJl73I8MbCnadxnjfNHVye67rbwTnLegdQ9aRUp+Lm7PC7FCE/2Hhq1fEl2hxKOxEPiZ8okTKYq2OHS62LK05Ux/BCEime3MbTprpdxvumKXd3uLPnAMTZ7h4vo4fHO0mguclIaDyZc7oCwRXtojjuo44z1xEpI7e7po4b2RcIc3q+xOH++2z7XGtuWeCgu+4c3dC9770jSU5K/7G6EPEvzezxIMZ6G+BwPJhxZyHSUpe7nZYQYB0goVOmJkdyljfIeqVD8rnzSlKXbsuiLM1lcKcqltuHlEW6lxIfDCZfuX5AejpyEEH9mofkE2ARtInaA8jCPLxGLJYoxNdVZKas6dkjfLPr9hYTjQ9Yl9bk//O6TvzqY3dJRpjOfjz6hwvK7YuvGd+LyQnOltRTrcFRHySC/h3DLug4ovnan49u4S0aruWS53uex8kUGI4CvM1v1fqCNxzUjfdqt97FN+4sIN6kLqiF7LJJ5/K2Ok33Ggh6ekgimRi7o1r+V6U+MRa156Fp1/f0ewhXhyjsXFAT/DBcqvGBHe0Jsn3Cf38mTN77y1toosEzrNxFu5MGGhQjdqqFJHnOE6VVWiaKtVwJJhJ5+NQooYovSZDGOUxOuZKFGATqhwC54irPppT9X/jOuNgocI94PEG7kExk0Jydcy63P1QkFvBni6nCTr880Xriy6LJZSYFzXa7yqvfREXIJTk64WnAW/gae0Jo0LlF0HyMn3DE7SaE35w12PsqBPqmxhNMTrtQ6hR/IMwqrkRRBYCNQxAi3rxJbfoUXw5qDciBQ1UM3pydccecUOFcgqGpU5GgZaqSPcGd+hRvdd6OWIok7befmV2XpJSlOOMludhFOAlpHRa6FEiNDytx5+bNF23cT7qrIy8GwVWP1LeLoE3ie2BfrZzvFpvA5PfVNdrND9E6yb2zcVI59KdEeeP19jDrhNLGc9OEhPLDs24bb4Wv98etq0en+6nd3jGwpQSHYeqc4kIbQeFqm8OGE2+4/0mEXvxkyxyNUJxTwFvrI85NbttQ2l1r4B46KlM7WgrUEtoNQs6ZoulimVtOEE26xzAum158NomxcI+kWKV6P77Bc0PnJV44TOBnh5rmHjhS7s8eMkPYrM+fm6Pzuovqvo7ZYJvMk+d7WJyIIN0MQl3Iwp454VgOhn7W24jXe4/0LlpPGCKTtmBUNGuGGQ+ZSz7MWng01+ugti3TB2DeBZGVS374TTxnhxuO61LcNWt3I+70Q4EWLc2X5rzPviaeccF2vLFbiej7QXXcM+575eoecE/Q5NVryTjzlhH/o1viRBvjbYJvgZO/jOifi7CKQ7xq4/sj1mTLCNR+io7zk7GG8J+MgvmM5Xo2S1KVapmn6jqtWCFfPe7/cF98ZPvvM6VEUqcviernMDMSZ63QIk3C12ueC3ypz3UPezCRhdF9/UWRkmuYfV40IV9TCC389b6fZTjIYKYWbx/3fEEW1FLNprvBWCFcOxi0SVztTjJfLwWGjBCCfi0yY3Fqq5b2EY89AsbjaX8UmsVjJrrWYzV7iJVMgWUX3h+/hV/iL4KYii7GYp4l6CU+ciTjyv0dc7S9iUoRkDJbzj49u2C+u9udge5FPEFioAx1Qe0Bc7W8h9Ax2DTzojU4ouPy42pFgs1pDJnhi46CarsuPqx0NYe/R0Plmhq1Mq7nUuNqPYFckOZ/PZ5Hsl2nhlxpX+yFMCIEiSJ2KMhur8It7/jhGr++7Wiiee8KHK5XwS42r/S5MZbLApcbVfhVuUdXchcbVfhVQiOJi42q/B50mdpkHvc+kxCFYotOxwDhpvMQPYL1hAadERSw1wv8HnW1y/JWtQqHET2FU+k9KlChRokSJEiVKlChR4m/iP1kRzgpcJJGTAAAAAElFTkSuQmCC"
+# Decoded once so st.image can serve the logo from Streamlit's media endpoint
+_LOGO_BYTES = base64.b64decode(_LOGO_B64)
+
+@st.cache_data(show_spinner=False)
+def _load_knowl():
+    """
+    Load the knowledge-break snippets once per process instead of on every rerun.
+    """
+    import pandas as pd
+    columns = {"Description", "Content", "KnowlURL", "Links"}
+    return pd.read_csv('KnowlLinksGPTfy.csv', encoding='ISO-8859-1', usecols=lambda c: c in columns)
+
 def show_random_text():
-    st.write('📚 Knowledge Break: Learn While You Wait! ⏳')
-    data = pd.read_csv('KnowlLinksGPTfy.csv',encoding='ISO-8859-1')
-    row = random.choice(data.index)
-    # Display random text with emojis
-    st.session_state.Description = data.loc[row, 'Description']
-    st.session_state.Content = data.loc[row, 'Content']
-    st.session_state.Links = data.loc[row, 'Links']
-    st.write(f"### {st.session_state.Description} 💡😊")
-    st.write(f"{st.session_state.Content} 📘✨")
-    st.write(f"[Read More]({st.session_state.Links})")
+    """
+    Show the knowledge-break snippet, picking a random one if none is stored yet.
+    """
+    st.header('📚 Knowledge Break: Learn While You Wait! ⏳')
+    if st.session_state.Description is None:
+        import numpy as np
+        data = _load_knowl()
+        row = data.iloc[int(np.random.default_rng().integers(len(data)))]
+        st.session_state.Description = row['Description']
+        st.session_state.Content = row['Content']
+        st.session_state.KnowlURL = row['KnowlURL']
+    # Display random text with emojis as one element
+    st.markdown(
+        f"### {st.session_state.Description} 💡😊\n\n"
+        f"{st.session_state.Content} 📘✨\n\n"
+        f"[Read More]({st.session_state.KnowlURL})"
+    )
+
+@st.cache_resource
+def get_llm_cache():
+    """
+    Open the on-disk LLM response cache once and share it between all sessions.
+    """
+    import diskcache
+    from commonscrape import LLM_CACHE_DIR
+    return diskcache.Cache(LLM_CACHE_DIR)
+
+def create_extractor(firecrawl_api_key, google_api_key, skip_non_faq_pages=True):
+    """
+    Build a fresh FAQExtractor for one extraction run.
+
+    Extractors hold per-run state (rows, progress, HTTP and LLM clients bound to
+    the run's event loop), so they are never shared between runs or sessions;
+    only the stateless LLM cache is.
+    """
+    # Imported here so the crawler and LLM stack only load once an extraction starts
+    from commonscrape import FAQExtractor
+    return FAQExtractor(
+        firecrawl_api_key,
+        google_api_key,
+        skip_non_faq_pages=skip_non_faq_pages,
+        cache=get_llm_cache(),
+    )
+
+@st.cache_resource
+def get_gcs_client():
+    """
+    Build the GCP storage client once and reuse its credentials and connections.
+    """
+    # Imported here so sessions that never upload skip loading the Google Cloud SDK
+    from google.cloud import storage
+    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = "gptfy-ai-playground-1bc58dbd197f.json"
+    return storage.Client()
 
-def get_csv_download_link(df, filename="extracted_faqs.csv"):
+@st.cache_resource
+def get_gcs_bucket(bucket_name):
     """
-    Generate a download link for the CSV file.
+    Reuse one bucket handle per bucket name on top of the cached client.
+    """
+    return get_gcs_client().bucket(bucket_name)
+
+def build_results(rows):
     """
-    csv = df.to_csv(index=False)
-    b64 = base64.b64encode(csv.encode()).decode()
-    href = f'<a href="data:file/csv;base64,{b64}" download="{filename}">Download CSV file</a>'
-    return href
+    Build the results DataFrame for a finished extraction.
 
-def upload_to_gcp_bucket(file_path, bucket_name, destination_blob_name):
+    Low-cardinality label columns are stored as categoricals, since the frame
+    lives in session state for the rest of the session. Columns where the LLM
+    returned anything other than strings (lists, dicts) are left as objects.
     """
-    Upload a file to a GCP bucket
+    import pandas as pd
+    from commonscrape import FAQ_COLUMNS
+    df = pd.DataFrame.from_records(rows, columns=list(FAQ_COLUMNS))
+    for column in ('organisation_name', 'category'):
+        values = df[column]
+        if values.map(type).eq(str).all() and values.nunique() < 0.5 * len(df):
+            df[column] = df[column].astype('category')
+    return df
+
+def as_arrow(df):
+    """
+    Convert the results DataFrame to an Arrow table for st.dataframe.
+
+    Called once per extraction, so reruns skip st.dataframe's own conversion.
+    Frames with mixed-type object columns (e.g. an LLM field that is a list in
+    one row and a string in another) are returned unchanged, leaving them to
+    Streamlit's own conversion and its fallback for such columns.
     """
     try:
-        os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = "gptfy-ai-playground-1bc58dbd197f.json"
-        
-        # Initialize a GCP storage client and upload the file
-        client = storage.Client()
-        bucket = client.bucket(bucket_name)
-        blob = bucket.blob(destination_blob_name)
-        blob.upload_from_filename(file_path)
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except pa.ArrowException as e:
+        logger.warning(f"Showing results without Arrow pre-conversion: {str(e)}")
+        return df
+
+# Bounded because every selection change in every session adds an entry
+@st.cache_data(show_spinner=False, max_entries=16, ttl=3600)
+def df_to_csv_bytes(df):
+    """
+    Serialize a DataFrame to CSV bytes once per distinct DataFrame.
+
+    Uses PyArrow's vectorised CSV writer when the frame converts cleanly,
+    falling back to pandas for mixed-type columns Arrow rejects. The bytes start with a
+    UTF-8 BOM, like the saved CSV, so Excel detects the encoding.
+    """
+    buf = io.BytesIO(codecs.BOM_UTF8)
+    buf.seek(0, io.SEEK_END)
+    try:
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buf)
+        return buf.getvalue()
+    except pa.ArrowException as e:
+        logger.warning(f"PyArrow CSV export failed, falling back to pandas: {str(e)}")
+
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False, encoding="utf-8-sig")
+    return buf.getvalue()
+
+def _new_blob(bucket, destination_blob_name):
+    """
+    Create a blob handle set up for chunked resumable uploads.
+    """
+    return bucket.blob(destination_blob_name, chunk_size=UPLOAD_CHUNK_SIZE)
+
+def upload_df_to_gcp_bucket(df, bucket_name, destination_blob_name, compress=True):
+    """
+    Upload a DataFrame to a GCP bucket as CSV, straight from memory
+
+    With compress, the CSV is gzipped and stored with Content-Encoding: gzip,
+    so GCS still serves it to clients as plain CSV.
+    """
+    try:
+        data = df_to_csv_bytes(df)
+        blob = _new_blob(get_gcs_bucket(bucket_name), destination_blob_name)
+        if compress:
+            data = gzip.compress(data, compresslevel=6)
+            blob.content_encoding = "gzip"
+        blob.upload_from_file(
+            io.BytesIO(data),
+            size=len(data),
+            content_type="text/csv",
+            timeout=(10, 120)
+        )
         return True, f"File {destination_blob_name} uploaded to {bucket_name}."
     except Exception as e:
         return False, f"Error uploading to GCP: {str(e)}"
 
 
+@st.fragment
+def sidebar_inputs():
+    """
+    Render the sidebar inputs and Extract button.
+
+    Runs as a fragment so typing in these widgets only reruns this function
+    rather than the whole page. Starting an extraction triggers a full rerun.
+    """
+    # API Keys Input
+    st.header("API Keys")
+    firecrawl_api_key = st.text_input("Firecrawl API Key", type="password", key="firecrawl_api")
+    google_api_key = st.text_input("Google API Key", type="password", key="google_api")
+    
+    # Input section
+    st.header("Input Options")
+    input_option = st.radio("Choose input method:", ["Single URL", "CSV File Upload"], key="input_option")
+    
+    urls = None
+    
+    if input_option == "Single URL":
+        url = st.text_input("Enter a URL:", "https://platts.my.site.com/CIKnowledgeBase/s/article/How-do-I-reset-my-password-for-S-P-Global-Commodity-Insights-website", key="url_input")
+        if url:
+            urls = url
+    else:
+        uploaded_file = st.file_uploader("Upload a CSV file with URLs (Column Name: 'Links' or 'URL'):", type=["csv"], key="file_uploader")
+        if uploaded_file is not None:
+            try:
+                # Only one string column is needed, so read rows directly instead of building a DataFrame
+                uploaded_file.seek(0)
+                text_file = io.TextIOWrapper(uploaded_file, encoding="utf-8-sig", newline="")
+                try:
+                    reader = csv.DictReader(text_file)
+                    header = reader.fieldnames or []
+                    if "Links" in header or "URL" in header:
+                        column_name = "Links" if "Links" in header else "URL"
+                        links = [row[column_name].strip() for row in reader if row[column_name]]
+                        # Drop invalid and repeated links so each page is crawled and parsed once
+                        urls = list(dict.fromkeys(link for link in links if _URL_RE.match(link)))
+                        st.success(f"Found {len(links)} URLs in the uploaded CSV file.")
+                        if len(urls) < len(links):
+                            st.info(f"Kept {len(urls)} unique, valid URLs.")
+                    else:
+                        st.error("CSV file must contain a column named 'Links' or 'URL'.")
+                finally:
+                    # Hand the buffer back so Streamlit can reuse the upload on the next rerun
+                    text_file.detach()
+            except Exception as e:
+                st.error(f"Error reading CSV file: {str(e)}")
+    
+    # Max URLs Input
+    st.header("Settings")
+    max_urls = st.number_input("Maximum number of URLs to process (0 = no limit):", min_value=0, value=0, key="max_urls")
+    if max_urls == 0:
+        max_urls = None
+    # Apply the cap here so the extractor and the counts shown only ever see the URLs to process
+    if max_urls and isinstance(urls, list):
+        urls = urls[:max_urls]
+    # A single page was chosen on purpose, so only bulk runs skip pages without FAQ markers by default
+    skip_non_faq_pages = st.checkbox(
+        "Skip pages without FAQ-like content",
+        value=input_option != "Single URL",
+        key=f"skip_non_faq_{input_option}",
+        help="Pages without an FAQ heading or several questions are listed as failed without an LLM call."
+    )
+    
+    extraction_future = st.session_state.get("extraction_future")
+    extraction_running = extraction_future is not None and not extraction_future.done()
+    ready = bool(urls) and bool(firecrawl_api_key) and bool(google_api_key)
+
+    # Extract Button - add a unique key
+    if st.button(
+        "Extract FAQs",
+        key="extract_button",
+        disabled=not ready or extraction_running,
+        help=None if ready else "Please provide all required inputs: URLs and API keys."
+    ):
+        try:
+            extractor = create_extractor(firecrawl_api_key, google_api_key, skip_non_faq_pages)
+            # Known before the worker starts, so the first poll already shows 0/N
+            extractor.total_urls = len(urls) if isinstance(urls, list) else 1
+
+            # Clear the previous snippet so show_random_text picks a new one for this run
+            st.session_state.Description = None
+
+            # Run the extraction in a worker thread so the script thread stays free for widgets
+            if "executor" not in st.session_state:
+                st.session_state.executor = ThreadPoolExecutor(max_workers=1)
+            executor = st.session_state.executor
+            st.session_state.extractor = extractor
+            st.session_state.extraction_future = executor.submit(extractor.extract_faqs, urls)
+            st.rerun()
+        except Exception as e:
+            st.error(f"Error during extraction: {str(e)}")
+            logger.error(f"Error in Streamlit app: {str(e)}")
+
+
+@st.fragment
+def save_results(filtered_df):
+    """
+    Render the filename, GCP upload and download controls for the selected results.
+
+    Runs as a fragment so typing a filename or bucket name does not rerun the
+    page and re-send the full results DataFrame.
+    """
+    # Output filename input
+    st.subheader("Save Results")
+    custom_filename = st.text_input("Output CSV filename:", "extracted_faqs.csv", key="custom_filename")
+    
+    if not custom_filename.endswith('.csv'):
+        custom_filename += '.csv'
+    
+    # GCP bucket upload option
+    gcp_upload = st.checkbox("Upload to GCP Bucket", key="gcp_upload")
+    if gcp_upload:
+        bucket_name = st.text_input("GCP Bucket Name:", key="bucket_name")
+        gzip_upload = st.checkbox("Compress upload (gzip)", value=True, key="gcp_gzip")
+    
+    # Save and upload buttons
+    col3, col4 = st.columns(2)
+    with col3:
+        st.download_button(
+            label="Download CSV file",
+            data=df_to_csv_bytes(filtered_df),
+            file_name=custom_filename,
+            mime="text/csv",
+            key="dl_csv"
+        )
+    
+    with col4:
+        if gcp_upload and st.button("Upload to GCP", key="gcp_upload_button"):
+            # Reuses the cached CSV bytes from the download button, so nothing touches disk
+            success, message = upload_df_to_gcp_bucket(
+                filtered_df,
+                bucket_name,
+                f"faq_extracts/{custom_filename}",
+                compress=gzip_upload
+            )
+    
+            if success:
+                st.success(message)
+            else:
+                st.error(message)
+
+
+@st.fragment(run_every=1)
+def extraction_progress():
+    """
+    Show the progress of the running extraction, refreshing once a second.
+
+    Runs as a fragment so only this block reruns while the worker is busy; the
+    rest of the page stays rendered and the uploaded CSV is not re-read. Once
+    the extraction finishes, the whole app reruns to collect and show results.
+    """
+    extraction_future = st.session_state.get("extraction_future")
+    if extraction_future is None:
+        return
+    if extraction_future.done():
+        st.rerun()
+
+    extractor = st.session_state.extractor
+    st.progress(
+        extractor.progress / max(extractor.total_urls, 1),
+        text=f"Extracting FAQs... {extractor.progress}/{extractor.total_urls} URLs processed"
+    )
+
+    # The snippet is optional, so a bad knowledge file must not stop the polling
+    try:
+        show_random_text()
+    except Exception as e:
+        logger.warning(f"Could not show knowledge break: {str(e)}")
+
+
 def main():
     """
     Main Streamlit application.
@@ -69,133 +390,65 @@ def main():
     )
     
     # Initialize session state variables
-    if 'progress_placeholder' not in st.session_state:
-        st.session_state.progress_placeholder = st.empty()
-    if 'status_placeholder' not in st.session_state:
-        st.session_state.status_placeholder = st.empty()
-    if 'results_df' not in st.session_state:
-        st.session_state.results_df = None
-    if 'missed_urls' not in st.session_state:
-        st.session_state.missed_urls = []
-    if 'extraction_complete' not in st.session_state:
-        st.session_state.extraction_complete = False
-    if 'Description' not in st.session_state:
-        st.session_state.Description = None
-    if 'Content' not in st.session_state:
-        st.session_state.Content = None
-    if 'KnowlURL' not in st.session_state:
-        st.session_state.KnowlURL = None
+    for key, default in (
+        ('results_df', None),
+        ('missed_urls', []),
+        ('extraction_complete', False),
+        ('Description', None),
+        ('Content', None),
+        ('KnowlURL', None),
+    ):
+        st.session_state.setdefault(key, default)
     
     # Create side navigation bar
     with st.sidebar:
         st.sidebar.title("FAQ Extractor Tool")
         
-        # API Keys Input
-        st.header("API Keys")
-        firecrawl_api_key = st.text_input("Firecrawl API Key", type="password", key="firecrawl_api")
-        google_api_key = st.text_input("Google API Key", type="password", key="google_api")
-        
-        # Input section
-        st.header("Input Options")
-        input_option = st.radio("Choose input method:", ["Single URL", "CSV File Upload"], key="input_option")
-        
-        urls = None
-        
-        if input_option == "Single URL":
-            url = st.text_input("Enter a URL:", "https://platts.my.site.com/CIKnowledgeBase/s/article/How-do-I-reset-my-password-for-S-P-Global-Commodity-Insights-website", key="url_input")
-            if url:
-                urls = url
-        else:
-            uploaded_file = st.file_uploader("Upload a CSV file with URLs (Column Name: 'Links' or 'URL'):", type=["csv"], key="file_uploader")
-            if uploaded_file is not None:
-                try:
-                    df = pd.read_csv(uploaded_file)
-                    if "Links" in df.columns or "URL" in df.columns:
-                        column_name = "Links" if "Links" in df.columns else "URL"
-                        urls = df[column_name].tolist()
-                        st.success(f"Found {len(urls)} URLs in the uploaded CSV file.")
-                    else:
-                        st.error("CSV file must contain a column named 'Links' or 'URL'.")
-                except Exception as e:
-                    st.error(f"Error reading CSV file: {str(e)}")
-        
-        # Max URLs Input
-        st.header("Settings")
-        max_urls = st.number_input("Maximum number of URLs to process (0 = no limit):", min_value=0, value=0, key="max_urls")
-        if max_urls == 0:
-            max_urls = None
-        
-        # Extract Button - add a unique key
-        if st.button("Extract FAQs", key="extract_button") and urls and firecrawl_api_key and google_api_key:
+        sidebar_inputs()
+
+        # Poll a running extraction, or collect its results once it has finished
+        extraction_future = st.session_state.get("extraction_future")
+        if extraction_future is not None and not extraction_future.done():
+            extraction_progress()
+        elif extraction_future is not None:
+            extractor = st.session_state.extractor
+            del st.session_state.extraction_future
             try:
-                # Create progress placeholders
-                st.session_state.progress_placeholder = st.empty()
-                st.session_state.status_placeholder = st.empty()
-                
-                # Initialize extractor with user-provided API keys
-                extractor = FAQExtractor(firecrawl_api_key, google_api_key)
-                
-                # Extract FAQs
-                with st.spinner("Extracting FAQs..."):
-
-                    ## Show random text while waiting
-                    st.header('📚 Knowledge Break: Learn While You Wait! ⏳')
-                    data = pd.read_csv('KnowlLinksGPTfy.csv',encoding='ISO-8859-1')
-                    row = random.choice(data.index)
-                    # Display random text with emojis
-                    st.session_state.Description = data.loc[row, 'Description']
-                    st.session_state.Content = data.loc[row, 'Content']
-                    st.session_state.KnowlURL = data.loc[row, 'KnowlURL']
-                    st.write(f"### {st.session_state.Description} 💡😊")
-                    st.write(f"{st.session_state.Content} 📘✨")
-                    st.write(f"[Read More]({st.session_state.KnowlURL})")
-
-                    results = extractor.extract_faqs(urls, max_urls=max_urls)
-                
+                results = extraction_future.result()
+
                 # Create DataFrame from results
-                df_results = pd.DataFrame(extractor.data_dict)
-                
+                df_results = build_results(extractor.rows)
+
                 # Store results in session state
                 st.session_state.results_df = df_results
+                st.session_state.results_view = as_arrow(df_results)
+                st.session_state.pop("filtered_selection", None)
                 st.session_state.missed_urls = extractor.notcollected
                 st.session_state.extraction_complete = True
-                
+
                 st.success(f"Extraction completed! Processed {len(results['URL'])} URLs.")
-                if len(extractor.notcollected) == 0: 
+                if len(extractor.notcollected) == 0:
                     st.toast('Great Some Data Extracted!', icon='😍')
             except Exception as e:
                 st.error(f"Error during extraction: {str(e)}")
                 logger.error(f"Error in Streamlit app: {str(e)}")
-        elif urls is None or firecrawl_api_key == '' or google_api_key == '':
-            st.warning("Please provide all required inputs: URLs and API keys.")
     
-    # Display logo
-    image_link="data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAXAAAACJCAMAAAACLZNoAAAAllBMVEX///+LB+OHAOKDAOGCAOG6g+6aO+bOqPLKovKdRuezeOy+i++VK+XavvXn1/m3ge348f2nWunz6fzhy/f79/717fylVunDlPD59P3VtvTYvPXQrfPt3/rfx/fw5PusZ+qXNObp2fnkz/iQG+THnPGwcOuiUOjLpPKpYerTs/TPq/OWL+WydOytaOqPFeTEl/CgSujAj++zlD4RAAAPtElEQVR4nO1d6WLqKhA2A2rd61b3LtrFnm72/V/uJkDCsIaovVab78/pMQbhCwyzkkqlRIkSJUqUKFGiRIkSJUqUKFGixA9h1Gl9PH13Tt2NP4MWIRCDwOOpe/InMIhIxAEkKmf5j2MMEGUA+nHq/lw8GoDorg5O3Z2Lx5xKvu9Lun8eUTbB4ebUffkLmBA5v7MPB8P5az0Es/Xpen6euJYChY75R4sboCQY9H182hGcGbZSoEzYB1exSh4VAdDZicdwTljLCU7YB/2CdLOlUTIejDc5wZvJ/5vEx6yT8VKqBGIh+SXD+P8P1EOrG1AaS4FANiaTKE/F5Qmf4tenHsl5oIpszFryAexJOFmceihngQESINCLPxgXkyiJg1H89X7qsZwFbrDT6iX+4KHAlgmEvD0/1whN1Bq+Pkr4scLzmSRu2W4w4UDfu7yV2/o9jSf6SUdyJthggU0S/kIJB9qaooaGbQKnGsQZ4Uphly4roYQDrY60tqr0FCM4L4xUcmnimA0hHOiHxcx5/d/7f3Z4VzVApknnEw6k9iAamNY/arX+ZHnKQZwRlpoGSBOhnEs4QOo2GfUoizsDfS6DFiFoaCZOCOHxXpneXpcmEtAHz++U4JjrJk4+4UBv0rk83GCfIoC+h5YwEOk2PHP4+Qgn0UrcO+5T9W7on3IoZ4GJwSy9rfgIBzpJ721Rw+FSOsRzcG36TLx6ONB+qgq+2vxbQEqh4sWdSRpJdj474UDehuLG7ps9IAR3pxzOsTEeT/O/VARdi1PQbdoDSQXG+M6UJgJ06PvB88Gq2gCaYLO9uj1aq28W2kiyJdoIh3YaXJg46Y6/tTla706ILyCpxzmxMBrd4zT7apvHLm9h5nidg1dJJxPfT3pxu3ppNZ8+npqt+up4s6o4VqDJS/JynIatYR0mN0zCIeLb4UMtL5q/XyB5UO8nSTDAQQiFft1quTarNrS+ruZdY8Me9qxftqCH0rMfjQVMj6MKVK3MOQinfFU1PdIkfTR7KOOzBjWeIxDasGiZFOxIUpE2TTXHuu76snn3M7rJGNG2+IgsGNjDaHbCReisFuK2pUWz3l70JSw5j4wYqdcGjh9SEwmjengcJZslum8pElL2cNzYB2knnMuJflBoueC+OYw8QgpIW3PQ5LrV6F2WObAP4fdGZ+A4QZWhI05sJZz3ZxYYWi60x7znCClk2jLkcwg0dcrvQbgSbkxqb0BkRh2MjWOcVi2FZz+4bjF6H25vXrfz2yRK8nSQUGvuTbhMsYyHcXdVf7wj9ChK4YurL0wP1wUZMz/Ds7GC58RtUP4LSp8OIzwiH/sSjooSakI0tSpHwMjZFSZSRraoxGN4chANU6NvAxNGoV2Q8Ii09iMcLe2juYWYDtFyjpQnK2vSg4WGe+GEw7OvBymmxvxm2h1J1HH153tWwhXFTmuJuRgMtdBxb/yzQmxJWxB61j4XRgeukn/cS5lz9W0h3K6320FXvk4I1DRvOqE3X/P1crnuPG5xcrqybUrCod3M8LEDqowJPuPvrp6aCnYyOrXpKVfev3jrchUfSRfsU5Yca1E2M7ClpPltWSj/X5F0rADVsKW0B7Qxx1dXN6n6Quv4c0S4amENXj5xg7Ysx7okfOfokyT8GDU040/g+9/KF9FhSt2Lwjh7Sg5LydFK3d+VWIArzcHGcDM+3LNeakENJ+GVxChHDbb1q5XKlSS8Ye8UIlzqJtNrCetdo+yy6tZgMjOXcKHnK/EcYCuuVkCm5Mc3leg1tSaBftN44mvCyUe4okVTM2/DR/ig+/DwsJQ5I+T1IcWaSljj5LvssprpxwhjS+XWN1nFdtGJ5N7FFbNVkSkOVVvXJNa4MepwMXao4SfwEl6ZIDX6yrjqI/yb1Y+hSSCrxdDcsGYHSzaJkgfFZTD5l/zt1X+p2C86TxFl3aDA9Tw0xRO3BaWGPoFb8aepPOOxOR/OyjA6/IRXUA/N4JOP8C/nQEil41cWM21CcwJ8ss/hKfnbr+LJsM1o2e12l7ctbrtlESKgu5f1eDRdzpsux1OO11BJSXcIVCtyCG9KTt+Mi/sSjnIbbG4L2apiIwlDkT+FnIx7qm95Ne694pUoQHto9i4ix4bg9RpiK6qQBz2HcBRUMX1OexMue2tRv2R9lDqQtCuEaV+PfsbJjUpCizuMR2zb1QvxHSE3yxSTwNKpkO2cQ/gQrX7j4t6EI8vbDNpm7iDNb57auUJfevIzLhPtGSZ0MxbdIua+cW0PKhN3Ki32HRQLEeUQvv4RwrGk0qMRcvfXlvQs7YpQkc1Ikk559P7SWa+ZGtwTasQrSTe40WpRf81+oXtvEeUeRzKaiGFugAw5hM9+RKRgtU4v1MtSTXTNX94jXEtGpppJGKGJVpR8VzTSFn646ROvwoevtHlbYpA7oCyHHmAiKcghXFouFsvHrxYmUE7oSZFclkoVqIOSNrlh22YOKQDB37rtd9eR/i7WCGULw3TP6Kb3ASGZumtLfXOVbSItiRTLuc0h/BM8l32ET8cxptJfBF/skwTJZWkqaut2AvbPK3g3BUitsIVPIU/2h+59pk/f3sfsMyGyxNSSKMsP2uqUOyuTkZ+/YEjcTzjSmOHbuFrEtNftJuk/Vd1a0jg0934ZXQGapQVUnXJFCIR/2dY3/qJ8jGrKLZD7dH81lowrZRzZ9ebe5oWX8BHqGTFzwA4hXPrWFcfX3KETMmBrmnymPorBjUOr+zT7M2Urw7CagG5T2aEtGVfdptQKPYWGjRuBHeLOR/gIpZLZduxDCEc/jMMr2cyxCji0kBNjMb1PTavPmnU5hG1eQxTqVZcMsScwBxGehQ9wVzyEK/u2zZdzEOHokmx66dIJOVQvN8hASt0U5W57254sQaLUna0sGYdqiA+Qc/2O5JbYCb+pjFKMH2aak8Gm3R9EODLOpRTM9HObNzjGt2qFA6SazKinyxW+bqofSM/gubtrh8UEtJFuxUMUobN7DVGetLuyM4dwpLiZbjRiM18PIhzJh8yiG7l1QgGtwgTIW7rf3T4rlFPmpLkmMY2ZxGovLE0olDdTjaOJDAVbPSEK11mvM+QR7oE94nQY4XKmZWkEsqbYtU7nen9RotJqI2+nfF5u48vScdKk97O5N5EEuPM36YrsnS1HH8XT3Q6A/QkHYnUXHEY4yu5Ola9M63f7g8yoDUh78EqkrxKxQF4pCP2A9b9KIO/gMSBtsXlI6WVTtFE6grtoYm/CgdhXzYGEo5A+9ydJB4Xb+W/L5pH7XWX2VNvUmkKz6NLUeBiwFfNY2+3uwcxzVQdLhaMxC5FbFGKccONOANmXcPh0DP9AwlHYhvc5S8/0+f5thysBqVnSuWL7XfzqI0XWyXjmUNwl5WySZ7u6VWaggI/z6Oz9CAfqzPs6lHAZwGNxiIFfJxSYWpWM2HTRZ0UsT0S/xhRUc3B54x02UMU+shKOhLgz3rwH4bHO3ncX/R9KuFSr2aacfdmfFPJl73I8MbCnadxnjfNHVye67rbwTnLegdQ9aRUp+Lm7PC7FCE/2Hhq1fEl2hxKOxEPiZ8okTKYq2OHS62LK05Ux/BCEime3MbTprpdxvumKXd3uLPnAMTZ7h4vo4fHO0mguclIaDyZc7oCwRXtojjuo44z1xEpI7e7po4b2RcIc3q+xOH++2z7XGtuWeCgu+4c3dC9770jSU5K/7G6EPEvzezxIMZ6G+BwPJhxZyHSUpe7nZYQYB0goVOmJkdyljfIeqVD8rnzSlKXbsuiLM1lcKcqltuHlEW6lxIfDCZfuX5AejpyEEH9mofkE2ARtInaA8jCPLxGLJYoxNdVZKas6dkjfLPr9hYTjQ9Yl9bk//O6TvzqY3dJRpjOfjz6hwvK7YuvGd+LyQnOltRTrcFRHySC/h3DLug4ovnan49u4S0aruWS53uex8kUGI4CvM1v1fqCNxzUjfdqt97FN+4sIN6kLqiF7LJJ5/K2Ok33Ggh6ekgimRi7o1r+V6U+MRa156Fp1/f0ewhXhyjsXFAT/DBcqvGBHe0Jsn3Cf38mTN77y1toosEzrNxFu5MGGhQjdqqFJHnOE6VVWiaKtVwJJhJ5+NQooYovSZDGOUxOuZKFGATqhwC54irPppT9X/jOuNgocI94PEG7kExk0Jydcy63P1QkFvBni6nCTr880Xriy6LJZSYFzXa7yqvfREXIJTk64WnAW/gae0Jo0LlF0HyMn3DE7SaE35w12PsqBPqmxhNMTrtQ6hR/IMwqrkRRBYCNQxAi3rxJbfoUXw5qDciBQ1UM3pydccecUOFcgqGpU5GgZaqSPcGd+hRvdd6OWIok7befmV2XpJSlOOMludhFOAlpHRa6FEiNDytx5+bNF23cT7qrIy8GwVWP1LeLoE3ie2BfrZzvFpvA5PfVNdrND9E6yb2zcVI59KdEeeP19jDrhNLGc9OEhPLDs24bb4Wv98etq0en+6nd3jGwpQSHYeqc4kIbQeFqm8OGE2+4/0mEXvxkyxyNUJxTwFvrI85NbttQ2l1r4B46KlM7WgrUEtoNQs6ZoulimVtOEE26xzAum158NomxcI+kWKV6P77Bc0PnJV44TOBnh5rmHjhS7s8eMkPYrM+fm6Pzuovqvo7ZYJvMk+d7WJyIIN0MQl3Iwp454VgOhn7W24jXe4/0LlpPGCKTtmBUNGuGGQ+ZSz7MWng01+ugti3TB2DeBZGVS374TTxnhxuO61LcNWt3I+70Q4EWLc2X5rzPviaeccF2vLFbiej7QXXcM+575eoecE/Q5NVryTjzlhH/o1viRBvjbYJvgZO/jOifi7CKQ7xq4/sj1mTLCNR+io7zk7GG8J+MgvmM5Xo2S1KVapmn6jqtWCFfPe7/cF98ZPvvM6VEUqcviernMDMSZ63QIk3C12ueC3ypz3UPezCRhdF9/UWRkmuYfV40IV9TCC389b6fZTjIYKYWbx/3fEEW1FLNprvBWCFcOxi0SVztTjJfLwWGjBCCfi0yY3Fqq5b2EY89AsbjaX8UmsVjJrrWYzV7iJVMgWUX3h+/hV/iL4KYii7GYp4l6CU+ciTjyv0dc7S9iUoRkDJbzj49u2C+u9udge5FPEFioAx1Qe0Bc7W8h9Ax2DTzojU4ouPy42pFgs1pDJnhi46CarsuPqx0NYe/R0Plmhq1Mq7nUuNqPYFckOZ/PZ5Hsl2nhlxpX+yFMCIEiSJ2KMhur8It7/jhGr++7Wiiee8KHK5XwS42r/S5MZbLApcbVfhVuUdXchcbVfhVQiOJi42q/B50mdpkHvc+kxCFYotOxwDhpvMQPYL1hAadERSw1wv8HnW1y/JWtQqHET2FU+k9KlChRokSJEiVKlChR4m/iP1kRzgpcJJGTAAAAAElFTkSuQmCC"
-
-    st.markdown(
-    """
-    <style>
-    .center {
-        display: flex;
-        justify-content: center;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True
-)
-
-    st.markdown(f'<div class="center"><img src={image_link} width="350"></div>', unsafe_allow_html=True)
+    # Display logo (centered)
+    col = st.columns([1, 2, 1])
+    col[1].image(_LOGO_BYTES, width=350)
      # Application name with styling (centered)
     st.markdown("<h1 style='text-align: center; color: #1E88E5;'>FAQ KnowlBase Creator</h1>", unsafe_allow_html=True)
     st.markdown("<p style='text-align: center;'>Extract FAQs from websites efficiently and accurately</p>", unsafe_allow_html=True)
     
     # Only show results if extraction has been completed
     if st.session_state.extraction_complete and st.session_state.results_df is not None:
+        import numpy as np
+        import pandas as pd
 
         st.subheader("Extracted FAQs Frame")
 
         # Display the results DataFrame with row and column selection
-        event_df=st.dataframe(st.session_state.results_df, key="results_dataframe",use_container_width=True,
+        event_df=st.dataframe(st.session_state.results_view, key="results_dataframe",use_container_width=True,
                      hide_index=True,
                      on_select="rerun",
                      selection_mode=["multi-row", "multi-column"],
@@ -207,7 +460,12 @@ def main():
         st.subheader("Selected Rows and Columns")
         row_index = event_df.selection.rows
         column_index = event_df.selection.columns
-        filtered_df = st.session_state.results_df.loc[row_index,column_index]
+        # Re-slice only when the selection changes; selected rows are positions, so use iloc
+        selection = (tuple(row_index), tuple(column_index))
+        if st.session_state.get("filtered_selection") != selection:
+            st.session_state.filtered_df = st.session_state.results_df.iloc[list(row_index)][list(column_index)]
+            st.session_state.filtered_selection = selection
+        filtered_df = st.session_state.filtered_df
         
 
         if len(row_index) == 0:
@@ -221,49 +479,14 @@ def main():
             # Display the filtered DataFrame based on selected rows and columns
             st.dataframe(filtered_df, use_container_width=True,height=200)
 
-            # Output filename input
-            st.subheader("Save Results")
-            custom_filename = st.text_input("Output CSV filename:", "extracted_faqs.csv", key="custom_filename")
-            
-            if not custom_filename.endswith('.csv'):
-                custom_filename += '.csv'
-                
-            # GCP bucket upload option
-            gcp_upload = st.checkbox("Upload to GCP Bucket", key="gcp_upload")
-            if gcp_upload:
-                bucket_name = st.text_input("GCP Bucket Name:", key="bucket_name")
-                
-            # Save and upload buttons
-            col3, col4 = st.columns(2)
-            with col3:
-                if st.button("Save CSV", key="save_csv_button"):
-                    # Save results to CSV
-                    #filtered_df.to_csv(custom_filename, index=False)
-                    # st.success(f"CSV saved as {custom_filename}")
-                    st.markdown(get_csv_download_link(filtered_df, custom_filename), unsafe_allow_html=True)
-            
-            with col4:
-                if gcp_upload and st.button("Upload to GCP", key="gcp_upload_button"):
-                    if not os.path.exists(custom_filename):
-
-                        filtered_df.to_csv(custom_filename, index=False, encoding = 'utf-8-sig')
-                    
-                    success, message = upload_to_gcp_bucket(
-                        custom_filename, 
-                        bucket_name, 
-                        f"faq_extracts/{custom_filename}"
-                    )
-                    
-                    if success:
-                        st.success(message)
-                    else:
-                        st.error(message)
-            
+            save_results(filtered_df)
+
         # Display missed URLs
         st.header('Extraction Failed')
+        missed = st.session_state.missed_urls
         missed_urls_df = pd.DataFrame({
-            'S_No': [i+1 for i in range(len(st.session_state.missed_urls))],
-            'Links': st.session_state.missed_urls
+            'S_No': np.arange(1, len(missed) + 1, dtype=np.int32),
+            'Links': pd.array(missed, dtype='string')
         })
         st.dataframe(missed_urls_df, key="missed_urls_dataframe")
 